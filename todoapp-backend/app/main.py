@@ -1,10 +1,12 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import os
 
 # Import routers
 from app.routers import auth, students, todos, chat, audit
+from app import singleflight
+from app.dependencies import get_current_user
 
 app = FastAPI(title="Todo API", description="Todo Management System with Audit")
 
@@ -20,6 +22,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Coalesce identical concurrent reads (todos, stats, audit)
+app.middleware("http")(singleflight.singleflight_middleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(students.router, prefix="/api/students", tags=["Students"])
@@ -46,6 +51,10 @@ async def root():
 async def health():
     return {"status": "healthy", "service": "backend"}
 
+@app.get("/metrics/singleflight")
+async def singleflight_metrics(current_user = Depends(get_current_user)):  # require login
+    return singleflight.get_metrics()
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8840))
     uvicorn.run("app.main:app", host="0.0.0.0", port=port)
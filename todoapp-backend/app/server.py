@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Production server entry point: gunicorn managing uvicorn workers.
+
+Run with `python -m app.server`. Settings come from environment variables
+(set through the Helm chart's backend.server values).
+"""
+import logging
+import math
+import os
+
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ProductionWorker(UvicornWorker):
+    # Pin the fast event loop and HTTP parser instead of relying on "auto"
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+
+CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_CPU_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_CPU_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+
+def _cgroup_cpu_limit():
+    # cgroup v2
+    try:
+        with open(CGROUP_V2_CPU_MAX) as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    # cgroup v1
+    try:
+        with open(CGROUP_V1_CPU_QUOTA) as f:
+            quota = int(f.read())
+        with open(CGROUP_V1_CPU_PERIOD) as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> float:
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, limit)
+    return cpus
+
+
+def worker_count() -> int:
+    # Default to one worker. The todos and students routers keep their data in
+    # per-process lists, which already diverge across pod replicas; one worker
+    # only avoids making that worse inside a pod. Set WORKERS=auto to size
+    # from CPU/cgroup limits. Not WEB_CONCURRENCY: gunicorn parses it as an int.
+    workers = os.getenv("WORKERS", "1").strip().lower()
+    if workers != "auto":
+        return max(1, int(workers))
+    per_core = float(os.getenv("WORKERS_PER_CORE", "1"))
+    workers = max(1, math.ceil(available_cpus() * per_core))
+    max_workers = int(os.getenv("MAX_WORKERS", "0"))
+    if max_workers > 0:
+        workers = min(workers, max_workers)
+    return workers
+
+
+def post_fork(server, worker):
+    # The app is preloaded in the master; never reuse its pooled DB connections
+    from app.database import engine
+    engine.dispose(close=False)
+
+
+def worker_exit(server, worker):
+    # Runs after uvicorn has drained in-flight requests and background tasks
+    from app.database import engine
+    engine.dispose()
+
+
+def build_options() -> dict:
+    port = int(os.getenv("PORT", 8840))
+    return {
+        "bind": f"{os.getenv('HOST', '0.0.0.0')}:{port}",
+        "workers": worker_count(),
+        "worker_class": "app.server.ProductionWorker",
+        # Import the app once in the master so workers share memory copy-on-write
+        "preload_app": True,
+        # Recycle workers periodically; jitter keeps them from restarting together.
+        # Off by default: a recycled worker would lose the in-memory mock data
+        "max_requests": int(os.getenv("MAX_REQUESTS", "0")),
+        "max_requests_jitter": int(os.getenv("MAX_REQUESTS_JITTER", "1000")),
+        # Seconds workers get to finish in-flight requests after SIGTERM
+        "graceful_timeout": int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+        "timeout": int(os.getenv("WORKER_TIMEOUT", "60")),
+        "keepalive": int(os.getenv("KEEP_ALIVE", "5")),
+        "accesslog": "-",
+        "errorlog": "-",
+        "loglevel": os.getenv("LOG_LEVEL", "info"),
+        "post_fork": post_fork,
+        "worker_exit": worker_exit,
+    }
+
+
+class ProductionServer(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+        return app
+
+
+if __name__ == "__main__":
+    options = build_options()
+    logger.info(f"Starting {options['workers']} workers on {options['bind']}")
+    ProductionServer(options).run()
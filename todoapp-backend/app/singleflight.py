@@ -0,0 +1,142 @@
+"""
+Single-flight coalescing for identical concurrent read requests.
+
+Concurrent GET requests that share a normalized key (scheme, host, path,
+query params, origin and auth scope) wait on one in-flight computation and share its
+serialized body.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Dict, Tuple
+from urllib.parse import parse_qsl
+
+from fastapi import Request
+from fastapi.responses import Response
+
+logger = logging.getLogger(__name__)
+
+# Comma separated path prefixes whose GET handlers may be coalesced
+SINGLEFLIGHT_PATHS = [
+    p.strip() for p in os.getenv(
+        "SINGLEFLIGHT_PATHS", "/api/todos,/api/audit"
+    ).split(",") if p.strip()
+]
+# Seconds a follower waits on the leader before running the request itself
+SINGLEFLIGHT_TIMEOUT = float(os.getenv("SINGLEFLIGHT_TIMEOUT", "5"))
+SINGLEFLIGHT_ENABLED = os.getenv("SINGLEFLIGHT_ENABLED", "true").lower() == "true"
+
+# Response headers that are recomputed per response and must not be copied
+_HOP_HEADERS = {"content-length", "transfer-encoding", "connection"}
+
+_in_flight: Dict[Tuple, asyncio.Future] = {}
+
+metrics = {
+    "leaders": 0,       # requests that ran the handler for their key
+    "coalesced": 0,     # requests served from another request's result
+    "timeouts": 0,      # followers that gave up waiting and ran the handler
+    "fallbacks": 0,     # followers whose leader failed or was not shareable
+}
+
+
+def _auth_scope(request: Request) -> str:
+    # Hash the credentials so two users never share a key, without keeping
+    # raw tokens in memory as dict keys
+    token = request.cookies.get("access_token", "")
+    header = request.headers.get("authorization", "")
+    return hashlib.sha256(f"{token}\0{header}".encode("utf-8")).hexdigest()
+
+
+def request_key(request: Request) -> Tuple:
+    params = tuple(sorted(parse_qsl(request.url.query, keep_blank_values=True)))
+    # Scheme and host are part of the key because redirects are built from
+    # them, and Origin because CORS headers vary with it
+    origin = request.headers.get("origin", "")
+    return (
+        request.method, request.url.scheme, request.url.netloc,
+        request.url.path, params, origin, _auth_scope(request),
+    )
+
+
+def _is_coalescable(request: Request) -> bool:
+    if not SINGLEFLIGHT_ENABLED or request.method != "GET":
+        return False
+    path = request.url.path
+    return any(path == p or path.startswith(p + "/") for p in SINGLEFLIGHT_PATHS)
+
+
+async def _run(request: Request, call_next):
+    response = await call_next(request)
+    body = b""
+    async for chunk in response.body_iterator:
+        body += chunk
+    headers = [
+        (k, v) for k, v in response.raw_headers
+        if k.decode("latin-1").lower() not in _HOP_HEADERS
+    ]
+    return response.status_code, headers, body
+
+
+def _build_response(status_code, headers, body) -> Response:
+    # Each caller gets its own Response around the shared bytes
+    response = Response(content=body, status_code=status_code)
+    response.raw_headers.extend(headers)
+    return response
+
+
+def _shareable(headers) -> bool:
+    # Never hand one client's cookies to another
+    return not any(k.decode("latin-1").lower() == "set-cookie" for k, _ in headers)
+
+
+async def singleflight_middleware(request: Request, call_next):
+    if not _is_coalescable(request):
+        return await call_next(request)
+
+    key = request_key(request)
+    future = _in_flight.get(key)
+
+    if future is not None:
+        try:
+            result = await asyncio.wait_for(
+                asyncio.shield(future), timeout=SINGLEFLIGHT_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            metrics["timeouts"] += 1
+            logger.warning(f"Single-flight wait timed out for {request.url.path}")
+            return await call_next(request)
+        except Exception:
+            metrics["fallbacks"] += 1
+            return await call_next(request)
+        if result is None:
+            metrics["fallbacks"] += 1
+            return await call_next(request)
+        metrics["coalesced"] += 1
+        return _build_response(*result)
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    metrics["leaders"] += 1
+    try:
+        result = await _run(request, call_next)
+    except BaseException:
+        # Followers fall back to running the request themselves
+        future.set_exception(RuntimeError("single-flight leader failed"))
+        future.exception()  # mark retrieved when nobody is waiting
+        raise
+    else:
+        future.set_result(result if _shareable(result[1]) else None)
+    finally:
+        _in_flight.pop(key, None)
+    return _build_response(*result)
+
+
+def get_metrics() -> dict:
+    # Counters are per worker process; pid tells the workers apart
+    return {
+        **metrics,
+        "in_flight": len(_in_flight),
+        "timeout": SINGLEFLIGHT_TIMEOUT,
+        "pid": os.getpid(),
+    }
@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+from app import server
+
+ENV_VARS = [
+    "WORKERS", "WORKERS_PER_CORE", "MAX_WORKERS", "MAX_REQUESTS",
+    "MAX_REQUESTS_JITTER", "GRACEFUL_TIMEOUT", "WEB_CONCURRENCY",
+]
+
+
+@pytest.fixture(autouse=True)
+def host(monkeypatch, tmp_path):
+    # 8 host CPUs and no cgroup files unless a test writes them
+    for name in ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(8)))
+    monkeypatch.setattr(server, "CGROUP_V2_CPU_MAX", str(tmp_path / "cpu.max"))
+    monkeypatch.setattr(server, "CGROUP_V1_CPU_QUOTA", str(tmp_path / "cfs_quota_us"))
+    monkeypatch.setattr(server, "CGROUP_V1_CPU_PERIOD", str(tmp_path / "cfs_period_us"))
+    return tmp_path
+
+
+def write_v1(tmp_path, quota, period=100000):
+    (tmp_path / "cfs_quota_us").write_text(f"{quota}\n")
+    (tmp_path / "cfs_period_us").write_text(f"{period}\n")
+
+
+def test_cgroup_v2_unlimited(host):
+    (host / "cpu.max").write_text("max 100000\n")
+    assert server._cgroup_cpu_limit() is None
+    assert server.available_cpus() == 8
+
+
+def test_cgroup_v2_half_cpu(host):
+    (host / "cpu.max").write_text("50000 100000\n")
+    assert server._cgroup_cpu_limit() == 0.5
+    assert server.available_cpus() == 0.5
+
+
+def test_cgroup_v1_unlimited(host):
+    write_v1(host, -1)
+    assert server._cgroup_cpu_limit() is None
+    assert server.available_cpus() == 8
+
+
+def test_cgroup_v1_quota(host):
+    write_v1(host, 200000)
+    assert server._cgroup_cpu_limit() == 2
+    assert server.available_cpus() == 2
+
+
+def test_no_cgroup_files():
+    assert server._cgroup_cpu_limit() is None
+    assert server.available_cpus() == 8
+
+
+def test_workers_default_to_one():
+    assert server.worker_count() == 1
+
+
+@pytest.mark.parametrize("value, expected", [("1", 1), ("3", 3), ("0", 1)])
+def test_workers_fixed(monkeypatch, value, expected):
+    monkeypatch.setenv("WORKERS", value)
+    assert server.worker_count() == expected
+
+
+def test_workers_auto_uses_cpus(monkeypatch):
+    monkeypatch.setenv("WORKERS", "auto")
+    assert server.worker_count() == 8
+
+
+def test_workers_auto_rounds_half_cpu_up(monkeypatch, host):
+    (host / "cpu.max").write_text("50000 100000\n")
+    monkeypatch.setenv("WORKERS", "auto")
+    assert server.worker_count() == 1
+
+
+def test_workers_auto_per_core_and_cap(monkeypatch, host):
+    write_v1(host, 150000)
+    monkeypatch.setenv("WORKERS", "auto")
+    monkeypatch.setenv("WORKERS_PER_CORE", "2")
+    assert server.worker_count() == 3
+    monkeypatch.setenv("MAX_WORKERS", "2")
+    assert server.worker_count() == 2
+
+
+def test_server_config_from_env(monkeypatch):
+    monkeypatch.setenv("WORKERS", "3")
+    monkeypatch.setenv("MAX_REQUESTS", "500")
+    monkeypatch.setenv("MAX_REQUESTS_JITTER", "50")
+    monkeypatch.setenv("GRACEFUL_TIMEOUT", "20")
+    cfg = server.ProductionServer(server.build_options()).cfg
+    assert cfg.preload_app is True
+    assert cfg.worker_class_str == "app.server.ProductionWorker"
+    assert cfg.worker_class is server.ProductionWorker
+    assert cfg.workers == 3
+    assert cfg.max_requests == 500
+    assert cfg.max_requests_jitter == 50
+    assert cfg.graceful_timeout == 20
+
+
+def test_server_config_defaults():
+    cfg = server.ProductionServer(server.build_options()).cfg
+    assert cfg.workers == 1
+    assert cfg.max_requests == 0
+    assert cfg.graceful_timeout == 30
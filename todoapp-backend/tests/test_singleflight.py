@@ -0,0 +1,131 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+
+from app import singleflight
+
+
+def make_app(calls, delay=0.2, fail_first=False, set_cookie=False):
+    app = FastAPI()
+    app.middleware("http")(singleflight.singleflight_middleware)
+
+    @app.get("/api/todos/")
+    async def slow_todos():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return []
+
+    @app.get("/api/todos/stats")
+    async def slow_stats(response: Response):
+        calls.append(1)
+        n = len(calls)
+        await asyncio.sleep(delay)
+        if fail_first and n == 1:
+            raise RuntimeError("boom")
+        if set_cookie:
+            response.set_cookie("session", f"s{n}")
+        return {"call": n}
+
+    return app
+
+
+async def fire(app, headers_list):
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*[
+            client.get("/api/todos/stats", headers=h) for h in headers_list
+        ])
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics(monkeypatch):
+    for k in singleflight.metrics:
+        singleflight.metrics[k] = 0
+    singleflight._in_flight.clear()
+    monkeypatch.setattr(singleflight, "SINGLEFLIGHT_TIMEOUT", 5.0)
+
+
+def test_identical_requests_share_one_call():
+    calls = []
+    responses = asyncio.run(fire(make_app(calls), [{}] * 5))
+    assert len(calls) == 1
+    assert [r.json() for r in responses] == [{"call": 1}] * 5
+    assert singleflight.metrics == {
+        "leaders": 1, "coalesced": 4, "timeouts": 0, "fallbacks": 0,
+    }
+
+
+def test_different_credentials_never_share():
+    calls = []
+    headers = [
+        {"Cookie": "access_token=alice"},
+        {"Cookie": "access_token=bob"},
+        {"Authorization": "Bearer alice"},
+        {"Authorization": "Bearer bob"},
+    ]
+    responses = asyncio.run(fire(make_app(calls), headers))
+    assert len(calls) == 4
+    assert sorted(r.json()["call"] for r in responses) == [1, 2, 3, 4]
+    assert singleflight.metrics["leaders"] == 4
+    assert singleflight.metrics["coalesced"] == 0
+
+
+def test_different_hosts_never_share():
+    calls = []
+    app = make_app(calls)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await asyncio.gather(
+                client.get("http://one/api/todos?student_id=1"),
+                client.get("http://two/api/todos?student_id=1"),
+                client.get("https://one/api/todos?student_id=1"),
+            )
+
+    responses = asyncio.run(run())
+    # FastAPI redirects to the trailing-slash route using the request's host
+    assert sorted(r.headers["location"] for r in responses) == [
+        "http://one/api/todos/?student_id=1",
+        "http://two/api/todos/?student_id=1",
+        "https://one/api/todos/?student_id=1",
+    ]
+    assert singleflight.metrics["leaders"] == 3
+    assert singleflight.metrics["coalesced"] == 0
+
+
+def test_set_cookie_responses_are_not_shared():
+    calls = []
+    responses = asyncio.run(fire(make_app(calls, set_cookie=True), [{}] * 3))
+    assert len(calls) == 3
+    cookies = sorted(r.headers["set-cookie"].split(";")[0] for r in responses)
+    assert cookies == ["session=s1", "session=s2", "session=s3"]
+    assert singleflight.metrics == {
+        "leaders": 1, "coalesced": 0, "timeouts": 0, "fallbacks": 2,
+    }
+
+
+def test_followers_fall_back_after_timeout(monkeypatch):
+    monkeypatch.setattr(singleflight, "SINGLEFLIGHT_TIMEOUT", 0.05)
+    calls = []
+    responses = asyncio.run(fire(make_app(calls, delay=0.3), [{}] * 3))
+    assert len(calls) == 3
+    assert sorted(r.json()["call"] for r in responses) == [1, 2, 3]
+    assert singleflight.metrics == {
+        "leaders": 1, "coalesced": 0, "timeouts": 2, "fallbacks": 0,
+    }
+
+
+def test_followers_fall_back_when_leader_raises():
+    calls = []
+    responses = asyncio.run(fire(make_app(calls, fail_first=True), [{}] * 3))
+    assert len(calls) == 3
+    statuses = sorted(r.status_code for r in responses)
+    assert statuses == [200, 200, 500]
+    assert sorted(r.json()["call"] for r in responses if r.status_code == 200) == [2, 3]
+    assert singleflight.metrics == {
+        "leaders": 1, "coalesced": 0, "timeouts": 0, "fallbacks": 2,
+    }
+    assert singleflight._in_flight == {}